@@ -5,64 +5,52 @@ Creates an index.html page listing all available benchmark reports.
 """
 
 import os
+import re
 import sys
 import json
 from datetime import datetime, timedelta
+from operator import itemgetter
 from pathlib import Path
+from string import Template
 
-def generate_index_html(results_dir, output_path):
-    """Generate an index HTML page for benchmark results."""
-
-    results_path = Path(results_dir)
-    html_dir = results_path / 'html'
+# Date suffix on report filenames: YYYYMMDD (group 1) or YYYY-MM-DD (group 2)
+DATE_SUFFIX_RE = re.compile(r'^(?:(\d{8})|(\d{4}-\d{2}-\d{2}))$')
 
-    if not html_dir.exists():
-        print(f"HTML results directory not found: {html_dir}")
-        return generate_empty_index(output_path)
-
-    # Find all HTML files
-    html_files = []
-    for html_file in html_dir.glob('*.html'):
-        if html_file.name == 'index.html':
-            continue
-        html_files.append(html_file)
-
-    # Sort by modification time (newest first)
-    html_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-
-    # Group reports by date
-    reports_by_date = {}
-    for html_file in html_files:
-        # Try to extract date from filename
-        parts = html_file.stem.split('_')
-        date_str = parts[-1] if parts[-1].replace('-', '').replace('_', '').isdigit() else None
+# Styles common to the index and empty-index pages
+SHARED_CSS = """\
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            margin: 0;
+            padding: 20px;
+            background-color: #f5f5f5;
+            line-height: 1.6;
+        }
+        .header {
+            text-align: center;
+            margin-bottom: 40px;
+            border-bottom: 2px solid #e1e5e9;
+            padding-bottom: 20px;
+        }
+        .header h1 {
+            color: #2c3e50;
+            margin: 0;
+            font-size: 2.5em;
+        }
+        .empty-state {
+            text-align: center;
+            padding: 60px 20px;
+            color: #7f8c8d;
+        }
+        .footer {
+            text-align: center;
+            margin-top: 40px;
+            padding-top: 20px;
+            border-top: 1px solid #e1e5e9;
+            color: #7f8c8d;
+        }"""
 
-        try:
-            if date_str and len(date_str) == 8:  # YYYYMMDD format
-                date_obj = datetime.strptime(date_str, '%Y%m%d')
-            elif date_str and '-' in date_str:  # YYYY-MM-DD format
-                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-            else:
-                # Use file modification time
-                date_obj = datetime.fromtimestamp(html_file.stat().st_mtime)
-        except ValueError:
-            date_obj = datetime.fromtimestamp(html_file.stat().st_mtime)
-
-        date_key = date_obj.strftime('%Y-%m-%d')
-        if date_key not in reports_by_date:
-            reports_by_date[date_key] = []
-
-        platform = '_'.join(parts[:-1]) if len(parts) > 1 else html_file.stem
-        reports_by_date[date_key].append({
-            'platform': platform,
-            'filename': html_file.name,
-            'file_path': html_file.relative_to(results_path).as_posix(),
-            'size': html_file.stat().st_size,
-            'modified': date_obj
-        })
-
-    # Generate HTML
-    index_template = """
+# Page template for the report index
+INDEX_TEMPLATE = Template("""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -70,68 +58,51 @@ def generate_index_html(results_dir, output_path):
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>LLM Performance Benchmark Reports</title>
     <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background-color: #f5f5f5;
-            line-height: 1.6;
-        }}
-        .container {{
+${shared_css}
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             border-radius: 8px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
             padding: 30px;
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 40px;
-            border-bottom: 2px solid #e1e5e9;
-            padding-bottom: 20px;
-        }}
-        .header h1 {{
-            color: #2c3e50;
-            margin: 0;
-            font-size: 2.5em;
-        }}
-        .header p {{
+        }
+        .header p {
             color: #7f8c8d;
             font-size: 1.1em;
             margin: 10px 0 0 0;
-        }}
-        .stats {{
+        }
+        .stats {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin: 30px 0;
-        }}
-        .stat-card {{
+        }
+        .stat-card {
             background: #f8f9fa;
             border-radius: 8px;
             padding: 20px;
             text-align: center;
             border-left: 4px solid #3498db;
-        }}
-        .stat-number {{
+        }
+        .stat-number {
             font-size: 2em;
             font-weight: bold;
             color: #2c3e50;
             display: block;
-        }}
-        .stat-label {{
+        }
+        .stat-label {
             color: #7f8c8d;
             font-size: 0.9em;
             margin-top: 5px;
-        }}
-        .date-section {{
+        }
+        .date-section {
             margin: 30px 0;
             border: 1px solid #e1e5e9;
             border-radius: 8px;
             overflow: hidden;
-        }}
-        .date-header {{
+        }
+        .date-header {
             background: #2c3e50;
             color: white;
             padding: 15px 20px;
@@ -140,43 +111,43 @@ def generate_index_html(results_dir, output_path):
             display: flex;
             justify-content: space-between;
             align-items: center;
-        }}
-        .date-badge {{
+        }
+        .date-badge {
             background: #3498db;
             padding: 5px 15px;
             border-radius: 20px;
             font-size: 0.8em;
-        }}
-        .reports-grid {{
+        }
+        .reports-grid {
             display: grid;
             grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
             gap: 20px;
             padding: 20px;
             background: #f8f9fa;
-        }}
-        .report-card {{
+        }
+        .report-card {
             background: white;
             border-radius: 8px;
             padding: 20px;
             border: 1px solid #e1e5e9;
             transition: transform 0.2s, box-shadow 0.2s;
             cursor: pointer;
-        }}
-        .report-card:hover {{
+        }
+        .report-card:hover {
             transform: translateY(-2px);
             box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-        }}
-        .report-title {{
+        }
+        .report-title {
             font-weight: bold;
             color: #2c3e50;
             font-size: 1.1em;
             margin-bottom: 10px;
-        }}
-        .report-meta {{
+        }
+        .report-meta {
             color: #7f8c8d;
             font-size: 0.9em;
-        }}
-        .report-size {{
+        }
+        .report-size {
             display: inline-block;
             background: #e8f4f8;
             color: #3498db;
@@ -184,39 +155,27 @@ def generate_index_html(results_dir, output_path):
             border-radius: 12px;
             font-size: 0.8em;
             margin-top: 5px;
-        }}
-        .empty-state {{
-            text-align: center;
-            padding: 60px 20px;
-            color: #7f8c8d;
-        }}
-        .empty-state h3 {{
+        }
+        .empty-state h3 {
             margin-top: 0;
             color: #95a5a6;
-        }}
-        .footer {{
-            text-align: center;
-            margin-top: 40px;
-            padding-top: 20px;
-            border-top: 1px solid #e1e5e9;
-            color: #7f8c8d;
-        }}
-        .refresh-info {{
+        }
+        .refresh-info {
             background: #e8f5e8;
             border: 1px solid #d4edda;
             border-radius: 8px;
             padding: 15px;
             margin: 20px 0;
             color: #155724;
-        }}
-        .comparison-badge {{
+        }
+        .comparison-badge {
             background: #27ae60;
             color: white;
             padding: 2px 8px;
             border-radius: 12px;
             font-size: 0.8em;
             margin-left: 8px;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -228,19 +187,19 @@ def generate_index_html(results_dir, output_path):
 
         <div class="stats">
             <div class="stat-card">
-                <span class="stat-number">{total_reports}</span>
+                <span class="stat-number">${total_reports}</span>
                 <div class="stat-label">Total Reports</div>
             </div>
             <div class="stat-card">
-                <span class="stat-number">{total_dates}</span>
+                <span class="stat-number">${total_dates}</span>
                 <div class="stat-label">Test Days</div>
             </div>
             <div class="stat-card">
-                <span class="stat-number">{platforms_count}</span>
+                <span class="stat-number">${platforms_count}</span>
                 <div class="stat-label">Platforms Tested</div>
             </div>
             <div class="stat-card">
-                <span class="stat-number">{last_updated}</span>
+                <span class="stat-number">${last_updated}</span>
                 <div class="stat-label">Last Updated</div>
             </div>
         </div>
@@ -250,116 +209,22 @@ def generate_index_html(results_dir, output_path):
            Reports are generated daily at 00:00 UTC.
         </div>
 
-        {reports_html}
+        ${reports_html}
 
         <div class="footer">
             <p>
                 Generated with guidellm benchmark suite •
                 <a href="https://github.com/YOUR_USERNAME/llm-benchmark-suite">Repository</a> •
-                Last generated: {generation_time}
+                Last generated: ${generation_time}
             </p>
         </div>
     </div>
 </body>
 </html>
-    """
-
-    if not reports_by_date:
-        return generate_empty_index(output_path)
-
-    # Calculate statistics
-    total_reports = sum(len(reports) for reports in reports_by_date.values())
-    total_dates = len(reports_by_date)
-    platforms = set()
-    for reports in reports_by_date.values():
-        for report in reports:
-            platforms.add(report['platform'])
-    platforms_count = len(platforms)
-
-    # Find most recent report for last updated time
-    last_updated = "Never"
-    if reports_by_date:
-        most_recent_date = sorted(reports_by_date.keys(), reverse=True)[0]
-        if reports_by_date[most_recent_date]:
-            last_modified = max(report['modified'] for report in reports_by_date[most_recent_date])
-            last_updated = last_modified.strftime('%H:%M')
-
-    # Generate HTML for reports
-    reports_html = ""
-    for date_str in sorted(reports_by_date.keys(), reverse=True):
-        reports = reports_by_date[date_str]
-
-        # Format date for display
-        try:
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-            display_date = date_obj.strftime('%B %d, %Y')
-            day_ago = (datetime.now() - date_obj).days
-            if day_ago == 0:
-                time_suffix = " (Today)"
-            elif day_ago == 1:
-                time_suffix = " (Yesterday)"
-            else:
-                time_suffix = f" ({day_ago} days ago)"
-        except ValueError:
-            display_date = date_str
-            time_suffix = ""
-
-        reports_html += f"""
-        <div class="date-section">
-            <div class="date-header">
-                <span>{display_date}{time_suffix}</span>
-                <span class="date-badge">{len(reports)} reports</span>
-            </div>
-            <div class="reports-grid">
-        """
-
-        for report in reports:
-            report_title = report['platform'].replace('_', ' ').title()
-
-            # Add comparison badge
-            comparison_badge = ""
-            if 'comparison' in report['filename'].lower():
-                comparison_badge = '<span class="comparison-badge">Comparison</span>'
-
-            # Format file size
-            size_kb = report['size'] / 1024
-            if size_kb < 1:
-                size_str = f"{report['size']} B"
-            elif size_kb < 1024:
-                size_str = f"{size_kb:.1f} KB"
-            else:
-                size_str = f"{size_kb/1024:.1f} MB"
+    """.replace('${shared_css}', SHARED_CSS))
 
-            reports_html += f"""
-            <div class="report-card" onclick="window.open('{report['file_path']}', '_blank')">
-                <div class="report-title">
-                    {report_title}
-                    {comparison_badge}
-                </div>
-                <div class="report-meta">
-                    📊 {report['modified'].strftime('%H:%M')} •
-                    <span class="report-size">{size_str}</span>
-                </div>
-            </div>
-            """
-
-        reports_html += """
-            </div>
-        </div>
-        """
-
-    return index_template.format(
-        total_reports=total_reports,
-        total_dates=total_dates,
-        platforms_count=platforms_count,
-        last_updated=last_updated,
-        reports_html=reports_html,
-        generation_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
-    )
-
-def generate_empty_index(output_path):
-    """Generate an empty index page when no reports are available."""
-    empty_template = """
+# Page template shown when no reports are available
+EMPTY_INDEX_TEMPLATE = Template("""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -367,63 +232,34 @@ def generate_empty_index(output_path):
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>LLM Performance Benchmark Reports</title>
     <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background-color: #f5f5f5;
-            line-height: 1.6;
-        }}
-        .container {{
+${shared_css}
+        .container {
             max-width: 800px;
             margin: 0 auto;
             background: white;
             border-radius: 8px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
             padding: 30px;
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 40px;
-            border-bottom: 2px solid #e1e5e9;
-            padding-bottom: 20px;
-        }}
-        .header h1 {{
-            color: #2c3e50;
-            margin: 0;
-            font-size: 2.5em;
-        }}
-        .empty-state {{
-            text-align: center;
-            padding: 60px 20px;
-            color: #7f8c8d;
-        }}
-        .empty-state h3 {{
+        }
+        .empty-state h3 {
             margin-top: 0;
             color: #95a5a6;
             font-size: 1.5em;
-        }}
-        .setup-steps {{
+        }
+        .setup-steps {
             text-align: left;
             background: #f8f9fa;
             border-radius: 8px;
             padding: 20px;
             margin: 20px 0;
-        }}
-        .setup-steps ol {{
+        }
+        .setup-steps ol {
             margin: 0;
             padding-left: 20px;
-        }}
-        .setup-steps li {{
+        }
+        .setup-steps li {
             margin: 10px 0;
-        }}
-        .footer {{
-            text-align: center;
-            margin-top: 40px;
-            padding-top: 20px;
-            border-top: 1px solid #e1e5e9;
-            color: #7f8c8d;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -452,18 +288,199 @@ def generate_empty_index(output_path):
             <p>
                 Generated with guidellm benchmark suite •
                 <a href="https://github.com/YOUR_USERNAME/llm-benchmark-suite">Repository</a> •
-                Generated: {generation_time}
+                Generated: ${generation_time}
             </p>
         </div>
     </div>
 </body>
 </html>
-    """
+    """.replace('${shared_css}', SHARED_CSS))
+
+# Per-date section and per-report card fragments of the index page
+DATE_SECTION_OPEN = """
+        <div class="date-section">
+            <div class="date-header">
+                <span>%s%s</span>
+                <span class="date-badge">%d reports</span>
+            </div>
+            <div class="reports-grid">
+        """
+
+DATE_SECTION_CLOSE = """
+            </div>
+        </div>
+        """
+
+REPORT_CARD = """
+            <div class="report-card" onclick="window.open('%s', '_blank')">
+                <div class="report-title">
+                    %s
+                    %s
+                </div>
+                <div class="report-meta">
+                    📊 %s •
+                    <span class="report-size">%s</span>
+                </div>
+            </div>
+            """
+
+def parse_ymd(date_str):
+    """Parse a YYYY-MM-DD string without going through strptime."""
+    return datetime(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]))
+
+def report_date(date_str_raw, mtime):
+    """Date a report from its filename suffix, falling back to the given mtime."""
+    match = DATE_SUFFIX_RE.match(date_str_raw)
+
+    try:
+        if match and match.group(1):  # YYYYMMDD format
+            date_str = match.group(1)
+            return datetime(int(date_str[:4]), int(date_str[4:6]), int(date_str[6:8]))
+        elif match:  # YYYY-MM-DD format
+            return parse_ymd(match.group(2))
+    except ValueError:
+        pass
+
+    # Use file modification time
+    return datetime.fromtimestamp(mtime)
+
+def generate_index_html(results_dir, output_path):
+    """Generate an index HTML page for benchmark results."""
+
+    results_path = Path(results_dir)
+    html_dir = results_path / 'html'
+
+    if not html_dir.exists():
+        print(f"HTML results directory not found: {html_dir}")
+        return generate_empty_index(output_path)
+
+    # Resolve the current time once for the whole render
+    now = datetime.now()
+    today_ord = now.toordinal()
+    generation_time = now.strftime('%Y-%m-%d %H:%M:%S UTC')
+
+    # Find all HTML files, stat'ing each entry once, and group them by date
+    reports_by_date = {}
+    with os.scandir(html_dir) as it:
+        for entry in it:
+            if not entry.name.endswith('.html') or entry.name == 'index.html':
+                continue
+            st = entry.stat()
+            mtime = st.st_mtime
+            size = st.st_size
+
+            stem = entry.name[:-len('.html')]
 
-    return empty_template.format(
+            # Try to extract date from filename
+            prefix, sep, date_str_raw = stem.rpartition('_')
+            date_obj = report_date(date_str_raw, mtime)
+
+            date_key = date_obj.strftime('%Y-%m-%d')
+            if date_key not in reports_by_date:
+                reports_by_date[date_key] = []
+
+            # Format file size
+            if size < 1024:
+                size_str = f"{size} B"
+            elif size < 1048576:
+                size_str = f"{size / 1024:.1f} KB"
+            else:
+                size_str = f"{size / 1048576:.1f} MB"
+
+            platform = prefix if sep else stem
+            reports_by_date[date_key].append({
+                'platform': platform,
+                'filename': entry.name,
+                'file_path': f'html/{entry.name}',
+                'size_str': size_str,
+                'modified': date_obj,
+                'modified_hhmm': date_obj.strftime('%H:%M'),
+                'mtime_ts': mtime,
+                'is_comparison': 'comparison' in stem.lower()
+            })
+
+    # Newest first within each date
+    for reports in reports_by_date.values():
+        reports.sort(key=itemgetter('mtime_ts'), reverse=True)
+
+    if not reports_by_date:
+        return generate_empty_index(output_path)
+
+    # Calculate statistics
+    total_reports = sum(len(reports) for reports in reports_by_date.values())
+    total_dates = len(reports_by_date)
+    platforms = set()
+    for reports in reports_by_date.values():
+        for report in reports:
+            platforms.add(report['platform'])
+    platforms_count = len(platforms)
+
+    # Find most recent report for last updated time
+    last_updated = "Never"
+    if reports_by_date:
+        most_recent_date = max(reports_by_date)
+        if reports_by_date[most_recent_date]:
+            last_modified = max(report['modified'] for report in reports_by_date[most_recent_date])
+            last_updated = last_modified.strftime('%H:%M')
+
+    # Generate HTML for reports, newest date first
+    reports_parts = []
+    for date_str in sorted(reports_by_date, reverse=True):
+        reports = reports_by_date[date_str]
+
+        # Format date for display
+        try:
+            date_obj = parse_ymd(date_str)
+            display_date = date_obj.strftime('%B %d, %Y')
+            day_ago = today_ord - date_obj.toordinal()
+            if day_ago == 0:
+                time_suffix = " (Today)"
+            elif day_ago == 1:
+                time_suffix = " (Yesterday)"
+            else:
+                time_suffix = f" ({day_ago} days ago)"
+        except ValueError:
+            display_date = date_str
+            time_suffix = ""
+
+        reports_parts.append(DATE_SECTION_OPEN % (display_date, time_suffix, len(reports)))
+
+        for report in reports:
+            report_title = report['platform'].replace('_', ' ').title()
+
+            # Add comparison badge
+            comparison_badge = ""
+            if report['is_comparison']:
+                comparison_badge = '<span class="comparison-badge">Comparison</span>'
+
+            reports_parts.append(REPORT_CARD % (
+                report['file_path'], report_title, comparison_badge,
+                report['modified_hhmm'], report['size_str']))
+
+        reports_parts.append(DATE_SECTION_CLOSE)
+
+    return INDEX_TEMPLATE.substitute(
+        total_reports=total_reports,
+        total_dates=total_dates,
+        platforms_count=platforms_count,
+        last_updated=last_updated,
+        reports_html=''.join(reports_parts),
+        generation_time=generation_time
+    )
+
+def generate_empty_index(output_path):
+    """Generate an empty index page when no reports are available."""
+    return EMPTY_INDEX_TEMPLATE.substitute(
         generation_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
     )
 
+def write_html_atomic(output_path, html_content):
+    """Write the page to a temporary file and rename it over the output path."""
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(html_content.encode('utf-8', 'replace'))
+    os.replace(tmp_path, output_path)
+
 def main():
     """Main function."""
     import argparse
@@ -475,8 +492,7 @@ def main():
 
     html_content = generate_index_html(args.results_dir, args.output)
 
-    with open(args.output, 'w') as f:
-        f.write(html_content)
+    write_html_atomic(args.output, html_content)
 
     print(f"Index page generated: {args.output}")
 
@@ -8,24 +8,38 @@ import os
 import sys
 import json
 import csv
+import math
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from string import Template
+
+# Use orjson for JSON when it is installed; it is much faster on large results
+try:
+    import orjson
+
+    def json_loads(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN and Infinity, which json.dump writes by default
+            return json.loads(data)
+
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    json_loads = json.loads
+    json_dumps = json.dumps
+
+NUMERIC_FIELDS = ['request_latency', 'response_time', 'tokens_per_second', 'prompt_tokens', 'completion_tokens']
 
 def load_result_data(file_path):
-    """Load benchmark result data from JSON or CSV file."""
+    """Load benchmark result data from a JSON file."""
     try:
         if file_path.endswith('.json'):
-            with open(file_path, 'r') as f:
-                return json.load(f)
-        elif file_path.endswith('.csv'):
-            # Load CSV data - assuming standard format
-            data = []
-            with open(file_path, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    data.append(row)
-            return data
+            with open(file_path, 'rb') as f:
+                return json_loads(f.read())
         else:
             print(f"Unsupported file format: {file_path}")
             return None
@@ -33,8 +47,91 @@ def load_result_data(file_path):
         print(f"Error loading {file_path}: {e}")
         return None
 
+def find_result_files(directory, extension):
+    """List directory entries with the given extension, or [] if the directory is missing."""
+    try:
+        with os.scandir(directory) as it:
+            return [entry for entry in it if entry.name.endswith(extension)]
+    except FileNotFoundError:
+        return []
+
+def reduce_rows(rows, columns, error_column):
+    """Aggregate positional rows in a single pass.
+
+    ``columns`` maps each numeric field to its position in a row and
+    ``error_column`` is the position of the error field (or None). Rows are
+    assumed to have no error when that field is empty. A field with any
+    non-numeric value is left out of the metrics entirely.
+    """
+    metrics = {}
+
+    # Running [sum, min, max, count] per field; count is None once the field
+    # has held a non-numeric value
+    acc = {field: [0.0, math.inf, -math.inf, 0] for field in columns}
+    cells = list(zip(columns.values(), acc.values()))
+
+    total_requests = 0
+    successful = 0
+    for row in rows:
+        total_requests += 1
+        if error_column is None or not row[error_column]:
+            successful += 1
+        for i, a in cells:
+            value = row[i]
+            if not value or a[3] is None:
+                continue
+            try:
+                x = float(value)
+            except (ValueError, TypeError):
+                a[3] = None
+                continue
+            a[0] += x
+            if x < a[1]:
+                a[1] = x
+            if x > a[2]:
+                a[2] = x
+            a[3] += 1
+
+    if total_requests == 0:
+        return metrics
+
+    for field, (total, lowest, highest, count) in acc.items():
+        if count:
+            metrics[field] = {
+                'avg': total / count,
+                'min': lowest,
+                'max': highest,
+                'count': count
+            }
+
+    metrics['total_requests'] = total_requests
+    metrics['success_rate'] = (successful / total_requests) * 100
+
+    return metrics
+
+def extract_metrics_from_csv(file_path):
+    """Stream a benchmark CSV file and extract its key metrics."""
+    try:
+        with open(file_path, 'r', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return {}
+
+            columns = {field: header.index(field) for field in NUMERIC_FIELDS if field in header}
+            error_column = header.index('error') if 'error' in header else None
+
+            # Skip blank lines like DictReader did, and pad short rows so every
+            # column can be indexed directly
+            width = len(header)
+            rows = (row if len(row) >= width else row + [''] * (width - len(row)) for row in reader if row)
+            return reduce_rows(rows, columns, error_column)
+    except Exception as e:
+        print(f"Error loading {file_path}: {e}")
+        return None
+
 def extract_metrics(data):
-    """Extract key metrics from benchmark data."""
+    """Extract key metrics from loaded JSON benchmark data."""
     metrics = {}
 
     if isinstance(data, list):
@@ -42,29 +139,10 @@ def extract_metrics(data):
         if len(data) == 0:
             return metrics
 
-        # Calculate averages for numeric fields
-        numeric_fields = ['request_latency', 'response_time', 'tokens_per_second', 'prompt_tokens', 'completion_tokens']
-
-        for field in numeric_fields:
-            if field in data[0]:
-                try:
-                    values = [float(row.get(field, 0)) for row in data if row.get(field)]
-                    if values:
-                        metrics[field] = {
-                            'avg': sum(values) / len(values),
-                            'min': min(values),
-                            'max': max(values),
-                            'count': len(values)
-                        }
-                except (ValueError, TypeError):
-                    continue
-
-        # Count total requests
-        metrics['total_requests'] = len(data)
-
-        # Calculate success rate (assuming successful requests have no error field)
-        successful = sum(1 for row in data if not row.get('error'))
-        metrics['success_rate'] = (successful / len(data)) * 100 if data else 0
+        fields = [field for field in NUMERIC_FIELDS if field in data[0]]
+        columns = {field: i for i, field in enumerate(fields)}
+        rows = ([row.get(field) for field in fields] + [row.get('error')] for row in data)
+        metrics = reduce_rows(rows, columns, len(fields))
 
     elif isinstance(data, dict):
         # Handle single result object
@@ -75,137 +153,135 @@ def extract_metrics(data):
 
     return metrics
 
-def generate_html_report(platforms_data, output_path, report_date):
-    """Generate HTML comparison report."""
-
-    html_template = """
+# Page template for the comparison report
+REPORT_TEMPLATE = Template("""
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>LLM Performance Comparison Report - {date}</title>
+    <title>LLM Performance Comparison Report - ${date}</title>
     <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
     <style>
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             margin: 0;
             padding: 20px;
             background-color: #f5f5f5;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             border-radius: 8px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
             padding: 30px;
-        }}
-        .header {{
+        }
+        .header {
             text-align: center;
             margin-bottom: 40px;
             border-bottom: 2px solid #e1e5e9;
             padding-bottom: 20px;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             color: #2c3e50;
             margin: 0;
             font-size: 2.5em;
-        }}
-        .header p {{
+        }
+        .header p {
             color: #7f8c8d;
             font-size: 1.1em;
             margin: 10px 0 0 0;
-        }}
-        .metrics-grid {{
+        }
+        .metrics-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
             gap: 20px;
             margin-bottom: 40px;
-        }}
-        .platform-card {{
+        }
+        .platform-card {
             background: #f8f9fa;
             border-radius: 8px;
             padding: 20px;
             border-left: 4px solid #3498db;
-        }}
-        .platform-card h3 {{
+        }
+        .platform-card h3 {
             margin: 0 0 15px 0;
             color: #2c3e50;
             font-size: 1.3em;
-        }}
-        .metric {{
+        }
+        .metric {
             display: flex;
             justify-content: space-between;
             margin: 8px 0;
             padding: 5px 0;
             border-bottom: 1px solid #e1e5e9;
-        }}
-        .metric:last-child {{
+        }
+        .metric:last-child {
             border-bottom: none;
-        }}
-        .metric-label {{
+        }
+        .metric-label {
             font-weight: 500;
             color: #555;
-        }}
-        .metric-value {{
+        }
+        .metric-value {
             font-weight: bold;
             color: #2c3e50;
-        }}
-        .chart-container {{
+        }
+        .chart-container {
             margin: 40px 0;
             padding: 20px;
             background: #f8f9fa;
             border-radius: 8px;
-        }}
-        .chart-container h3 {{
+        }
+        .chart-container h3 {
             margin-top: 0;
             color: #2c3e50;
-        }}
-        canvas {{
+        }
+        canvas {
             max-height: 400px;
-        }}
-        .best-value {{
+        }
+        .best-value {
             color: #27ae60 !important;
             font-weight: bold;
-        }}
-        .error-message {{
+        }
+        .error-message {
             background: #e74c3c;
             color: white;
             padding: 15px;
             border-radius: 8px;
             margin: 20px 0;
-        }}
-        .info-message {{
+        }
+        .info-message {
             background: #3498db;
             color: white;
             padding: 15px;
             border-radius: 8px;
             margin: 20px 0;
-        }}
-        .footer {{
+        }
+        .footer {
             text-align: center;
             margin-top: 40px;
             padding-top: 20px;
             border-top: 1px solid #e1e5e9;
             color: #7f8c8d;
-        }}
+        }
     </style>
 </head>
 <body>
     <div class="container">
         <div class="header">
             <h1>🚀 LLM Performance Comparison</h1>
-            <p>Benchmark report generated on {date}</p>
+            <p>Benchmark report generated on ${date}</p>
         </div>
 
-        {error_message}
+        ${error_message}
 
         <div class="metrics-grid">
-            {platform_cards}
+            ${platform_cards}
         </div>
 
-        {charts}
+        ${charts}
 
         <div class="footer">
             <p>Generated with guidellm benchmark suite • <a href="https://github.com/YOUR_USERNAME/llm-benchmark-suite">Repository</a></p>
@@ -213,22 +289,25 @@ def generate_html_report(platforms_data, output_path, report_date):
     </div>
 
     <script>
-        {chart_scripts}
+        ${chart_scripts}
     </script>
 </body>
 </html>
-    """
+    """)
+
+def generate_html_report(platforms_data, output_path, report_date):
+    """Generate HTML comparison report."""
 
     # Generate platform cards
-    platform_cards = ""
+    platform_cards = []
     for platform_name, metrics in platforms_data.items():
         if not metrics:
             continue
 
-        card_html = f"""
+        platform_cards.append(f"""
         <div class="platform-card">
             <h3>{platform_name}</h3>
-        """
+        """)
 
         # Add key metrics
         key_metrics = {
@@ -239,39 +318,38 @@ def generate_html_report(platforms_data, output_path, report_date):
         }
 
         for label, value in key_metrics.items():
-            card_html += f'<div class="metric"><span class="metric-label">{label}:</span><span class="metric-value">{value}</span></div>'
+            platform_cards.append(f'<div class="metric"><span class="metric-label">{label}:</span><span class="metric-value">{value}</span></div>')
 
-        card_html += "</div>"
-        platform_cards += card_html
+        platform_cards.append("</div>")
 
     # Generate charts
-    charts_html = ""
+    charts_html = []
     chart_scripts = ""
 
     if len(platforms_data) > 1:
         # Success rate chart
-        charts_html += """
+        charts_html.append("""
         <div class="chart-container">
             <h3>Success Rate Comparison</h3>
             <canvas id="successRateChart"></canvas>
         </div>
-        """
+        """)
 
         # Latency chart
-        charts_html += """
+        charts_html.append("""
         <div class="chart-container">
             <h3>Average Latency Comparison</h3>
             <canvas id="latencyChart"></canvas>
         </div>
-        """
+        """)
 
         # Throughput chart
-        charts_html += """
+        charts_html.append("""
         <div class="chart-container">
             <h3>Tokens per Second Comparison</h3>
             <canvas id="throughputChart"></canvas>
         </div>
-        """
+        """)
 
         # Generate chart data
         platforms = list(platforms_data.keys())
@@ -279,15 +357,21 @@ def generate_html_report(platforms_data, output_path, report_date):
         latencies = [platforms_data[p].get('request_latency', {}).get('avg', 0) for p in platforms]
         throughputs = [platforms_data[p].get('tokens_per_second', {}).get('avg', 0) for p in platforms]
 
+        # Serialize chart data once; the labels are shared by all three charts
+        platforms_json = json_dumps(platforms)
+        success_json = json_dumps(success_rates)
+        lat_json = json_dumps(latencies)
+        thr_json = json_dumps(throughputs)
+
         chart_scripts = f"""
         // Success Rate Chart
         new Chart(document.getElementById('successRateChart'), {{
             type: 'bar',
             data: {{
-                labels: {json.dumps(platforms)},
+                labels: {platforms_json},
                 datasets: [{{
                     label: 'Success Rate (%)',
-                    data: {json.dumps(success_rates)},
+                    data: {success_json},
                     backgroundColor: '#3498db',
                     borderColor: '#2980b9',
                     borderWidth: 1
@@ -308,10 +392,10 @@ def generate_html_report(platforms_data, output_path, report_date):
         new Chart(document.getElementById('latencyChart'), {{
             type: 'bar',
             data: {{
-                labels: {json.dumps(platforms)},
+                labels: {platforms_json},
                 datasets: [{{
                     label: 'Average Latency (seconds)',
-                    data: {json.dumps(latencies)},
+                    data: {lat_json},
                     backgroundColor: '#e74c3c',
                     borderColor: '#c0392b',
                     borderWidth: 1
@@ -331,10 +415,10 @@ def generate_html_report(platforms_data, output_path, report_date):
         new Chart(document.getElementById('throughputChart'), {{
             type: 'bar',
             data: {{
-                labels: {json.dumps(platforms)},
+                labels: {platforms_json},
                 datasets: [{{
                     label: 'Tokens per Second',
-                    data: {json.dumps(throughputs)},
+                    data: {thr_json},
                     backgroundColor: '#27ae60',
                     borderColor: '#229954',
                     borderWidth: 1
@@ -355,14 +439,21 @@ def generate_html_report(platforms_data, output_path, report_date):
     if not platforms_data:
         error_message = '<div class="error-message">No benchmark data found. Please run benchmarks first.</div>'
 
-    return html_template.format(
+    return REPORT_TEMPLATE.substitute(
         date=report_date,
         error_message=error_message,
-        platform_cards=platform_cards,
-        charts=charts_html,
+        platform_cards=''.join(platform_cards),
+        charts=''.join(charts_html),
         chart_scripts=chart_scripts
     )
 
+def write_html_atomic(output_path, html_content):
+    """Write the page to a temporary file and rename it over the output path."""
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(html_content.encode('utf-8', 'replace'))
+    os.replace(tmp_path, output_path)
+
 def main():
     """Main function to generate comparison report."""
     parser = argparse.ArgumentParser(description='Generate comparison report from benchmark results')
@@ -374,29 +465,36 @@ def main():
 
     results_dir = Path(args.results_dir)
 
-    # Find result files
+    # Find result files. Each directory is scanned once and a missing or empty
+    # directory yields no entries, so no result file is opened in that case.
     platforms_data = {}
 
     # Look for CSV files (primary format)
-    csv_files = list(results_dir.glob('csv/*.csv'))
-    for csv_file in csv_files:
-        platform_name = csv_file.stem.split('_')[0]  # Extract platform name from filename
-        data = load_result_data(csv_file)
-        if data:
-            metrics = extract_metrics(data)
+    csv_files = find_result_files(results_dir / 'csv', '.csv')
+    csv_paths = [csv_file.path for csv_file in csv_files]
+    if len(csv_paths) < 2:
+        csv_metrics = map(extract_metrics_from_csv, csv_paths)
+    else:
+        # Files are independent; parse them in parallel across processes
+        with ProcessPoolExecutor(max_workers=min(len(csv_paths), os.cpu_count() or 1)) as executor:
+            csv_metrics = list(executor.map(extract_metrics_from_csv, csv_paths))
+
+    for csv_file, metrics in zip(csv_files, csv_metrics):
+        platform_name = os.path.splitext(csv_file.name)[0].partition('_')[0]  # Extract platform name from filename
+        if metrics:
             platforms_data[platform_name] = metrics
-            print(f"Loaded data for {platform_name} from {csv_file}")
+            print(f"Loaded data for {platform_name} from {csv_file.path}")
 
     # Also check JSON files as fallback
     if not platforms_data:
-        json_files = list(results_dir.glob('json/*.json'))
+        json_files = find_result_files(results_dir / 'json', '.json')
         for json_file in json_files:
-            platform_name = json_file.stem.split('_')[0]
-            data = load_result_data(json_file)
+            platform_name = os.path.splitext(json_file.name)[0].partition('_')[0]
+            data = load_result_data(json_file.path)
             if data:
                 metrics = extract_metrics(data)
                 platforms_data[platform_name] = metrics
-                print(f"Loaded data for {platform_name} from {json_file}")
+                print(f"Loaded data for {platform_name} from {json_file.path}")
 
     if not platforms_data:
         print("No benchmark data found!")
@@ -407,8 +505,7 @@ def main():
         html_content = generate_html_report(platforms_data, args.output, args.date)
 
     # Write HTML report
-    with open(args.output, 'w') as f:
-        f.write(html_content)
+    write_html_atomic(args.output, html_content)
 
     print(f"Comparison report generated: {args.output}")
 
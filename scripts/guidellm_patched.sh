@@ -2,7 +2,8 @@
 
 # Wrapper script to run guidellm with authentication patch
 # Usage: ./guidellm_patched.sh benchmark run [OPTIONS]
+# Set PATCH_GUIDELLM_LOG_LEVEL=DEBUG to log each backend startup
 
-# Apply the patch by importing it before guidellm
-python -c "import patch_guidellm; from guidellm.__main__ import cli; cli()" "$@"
+# Apply the patch before starting the guidellm CLI
+python -c "import patch_guidellm; patch_guidellm.apply_patch(); from guidellm.__main__ import cli; cli()" "$@"
 
@@ -1,27 +1,56 @@
 """
 Monkey-patch guidellm to add Authorization header for authenticated endpoints.
-Import this before using guidellm CLI or library.
+Call apply_patch() before using guidellm CLI or library.
 """
+import logging
 import os
-from guidellm.backends.openai import OpenAIHTTPBackend
 
-# Store the original process_startup method
-_original_process_startup = OpenAIHTTPBackend.process_startup
+_LOG = logging.getLogger('patch_guidellm')
+
+_original_process_startup = None
 
 async def patched_process_startup(self):
     """Patched process_startup that adds Authorization header."""
     await _original_process_startup(self)
-    
+
     # Inject the Authorization header with the API key from the environment
     api_key = os.environ.get("OPENAI_API_KEY")
     if api_key:
         self._async_client.headers["Authorization"] = f"Bearer {api_key}"
-        print(f"✓ Added Authorization header for {self.target}")
+        _LOG.debug("Added Authorization header for %s", self.target)
     else:
-        print("⚠ Warning: OPENAI_API_KEY not found in environment variables.")
+        _LOG.warning("OPENAI_API_KEY not found in environment variables.")
+
+def configure_logging():
+    """Show this module's log messages when the application has not configured logging.
+
+    guidellm logs through loguru, so without this the stdlib logger falls back
+    to the last-resort handler and drops everything below WARNING. The level
+    comes from PATCH_GUIDELLM_LOG_LEVEL (default INFO).
+    """
+    if _LOG.handlers or logging.getLogger().handlers:
+        return
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('[%(levelname)s] %(name)s: %(message)s'))
+    _LOG.addHandler(handler)
+    level = os.environ.get("PATCH_GUIDELLM_LOG_LEVEL", "INFO").upper()
+    _LOG.setLevel(getattr(logging, level, logging.INFO))
+
+def apply_patch():
+    """Install the patched process_startup on guidellm's OpenAI backend."""
+    global _original_process_startup
+
+    configure_logging()
+
+    # Imported here so that importing this module does not load the backend
+    from guidellm.backends.openai import OpenAIHTTPBackend
 
-# Apply the monkey patch
-OpenAIHTTPBackend.process_startup = patched_process_startup
+    if OpenAIHTTPBackend.process_startup is patched_process_startup:
+        return
 
-print("✓ guidellm patched to support API key authentication")
+    # Store the original process_startup method and apply the monkey patch
+    _original_process_startup = OpenAIHTTPBackend.process_startup
+    OpenAIHTTPBackend.process_startup = patched_process_startup
 
+    _LOG.info("guidellm patched to support API key authentication")
@@ -4,144 +4,327 @@ Connection verification script for guidellm benchmarks.
 Tests API connectivity and authentication before running benchmarks.
 """
 
+# Only lightweight modules are imported up front so that a missing
+# configuration fails fast; HTTP and JSON libraries load on first use.
 import os
 import sys
-import json
-import requests
-from datetime import datetime
-
-def log_info(message):
-    """Print info message with timestamp."""
-    print(f"[INFO] {datetime.now().strftime('%H:%M:%S')} {message}")
-
-def log_error(message):
-    """Print error message with timestamp."""
-    print(f"[ERROR] {datetime.now().strftime('%H:%M:%S')} {message}", file=sys.stderr)
-
-def log_success(message):
-    """Print success message with timestamp."""
-    print(f"[SUCCESS] {datetime.now().strftime('%H:%M:%S')} {message}")
-
-def get_env_var(var_name):
-    """Get environment variable or None."""
-    value = os.environ.get(var_name)
-    if not value:
-        log_error(f"Environment variable {var_name} not set")
+import time
+import logging
+from functools import lru_cache
+
+# Stop counting /models entries after this many
+MAX_MODELS_COUNTED = 10_000
+
+# (connect, read) timeouts in seconds; a short connect timeout lets an
+# unreachable endpoint fail fast while slow responses still get time to arrive
+REQUEST_TIMEOUT = (3, 27)
+
+@lru_cache(maxsize=None)
+def get_session(api_key):
+    """Shared session so probes reuse one keep-alive connection (and its TLS handshake).
+
+    The request headers, including the API key, are set once when the session
+    is built.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    # Retry transient failures with exponential backoff; once retries run out
+    # the last 5xx response is returned so its status can be reported
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=('GET', 'HEAD'),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        'Authorization': f'Bearer {api_key}',
+        'Content-Type': 'application/json',
+        'Accept': 'application/json',
+        # The probe response is small; skip compression and its decode cost
+        'Accept-Encoding': 'identity'
+    })
+    return session
+
+# Log records go to stdout, errors to stderr, as "[LEVEL] HH:MM:SS message"
+SUCCESS = 25
+logging.addLevelName(SUCCESS, 'SUCCESS')
+
+log = logging.getLogger('verify')
+log.setLevel(logging.INFO)
+log.propagate = False
+
+_formatter = logging.Formatter('[%(levelname)s] %(asctime)s %(message)s', datefmt='%H:%M:%S')
+_stdout_handler = logging.StreamHandler(sys.stdout)
+_stdout_handler.addFilter(lambda record: record.levelno < logging.ERROR)
+_stdout_handler.setFormatter(_formatter)
+_stderr_handler = logging.StreamHandler(sys.stderr)
+_stderr_handler.setLevel(logging.ERROR)
+_stderr_handler.setFormatter(_formatter)
+log.addHandler(_stdout_handler)
+log.addHandler(_stderr_handler)
+
+# Messages take %-style arguments so formatting happens only when a record
+# is emitted; the formatter stamps the time with time.strftime
+log_info = log.info
+log_error = log.error
+
+def log_success(message, *args):
+    """Log a success message."""
+    log.log(SUCCESS, message, *args)
+
+@lru_cache(maxsize=None)
+def get_first_env(names):
+    """Return (value, name) for the first of the environment variables names that is set, or (None, None)."""
+    for name in names:
+        value = os.environ.get(name)
+        if value:
+            return value, name
+    return None, None
+
+class ChunkReader:
+    """File-like view over response.iter_content() for ijson.
+
+    Reading through requests rather than response.raw keeps read timeouts and
+    dropped connections wrapped as requests exceptions.
+    """
+
+    def __init__(self, response, chunk_size=64 * 1024):
+        self.chunks = response.iter_content(chunk_size=chunk_size)
+
+    def read(self, size=-1):
+        # ijson probes with read(0) to tell bytes from text
+        if size == 0:
+            return b''
+        return next(self.chunks, b'')
+
+def model_id_text(value):
+    """Return a model ID as text, or 'unknown' if it is not a string or number."""
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        return 'unknown'
+    return str(value)
+
+def sample_model_ids(response, limit=5, max_count=MAX_MODELS_COUNTED):
+    """Count models in a /models response and collect the first few IDs.
+
+    Returns (count, model_ids), or None if the response has no 'data' list.
+    Counting stops after max_count models. Raises ValueError if the body is
+    not valid JSON.
+    """
+    # ijson lets us stream the /models list instead of loading the whole body
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
+    if ijson is None:
+        # Use orjson when it is installed; it parses large lists much faster
+        try:
+            from orjson import loads as json_loads
+        except ImportError:
+            from json import loads as json_loads
+        models_data = json_loads(response.content)
+        if not isinstance(models_data, dict) or not isinstance(models_data.get('data'), list):
+            return None
+        # Count only object entries, as the streaming path does
+        models = [model for model in models_data['data'] if isinstance(model, dict)]
+        return min(len(models), max_count), [model_id_text(model.get('id')) for model in models[:limit]]
+
+    # Stream the body and stop once the list ends or max_count is reached
+    has_list = False
+    count = 0
+    model_ids = []
+    current_id = None
+    try:
+        for prefix, event, value in ijson.parse(ChunkReader(response)):
+            if prefix == 'data' and event == 'start_array':
+                has_list = True
+            elif prefix == 'data' and event == 'end_array':
+                break
+            elif prefix == 'data.item' and event == 'start_map':
+                count += 1
+                current_id = None
+            elif prefix == 'data.item.id' and current_id is None and event in ('string', 'number'):
+                current_id = str(value)
+            elif prefix == 'data.item' and event == 'end_map':
+                if len(model_ids) < limit:
+                    model_ids.append(current_id if current_id is not None else 'unknown')
+                if count >= max_count:
+                    break
+    except ijson.JSONError as e:
+        # ijson errors do not derive from ValueError; match the json/orjson path
+        raise ValueError(str(e)) from e
+    if not has_list:
         return None
-    return value
+    return count, model_ids
+
+@lru_cache(maxsize=None)
+def get_models_url(base_url):
+    """Build the /v1/models endpoint URL for an http(s):// API base URL."""
+    from urllib.parse import urljoin
 
-def test_simple_api_connection(base_url, api_key):
+    base = base_url.rstrip('/') + '/'
+    root = base if base.endswith('/v1/') else urljoin(base, 'v1/')
+    return urljoin(root, 'models')
+
+def probe_reachable(session, url):
+    """Check that the endpoint answers, without downloading a response body."""
+    return session.head(url, timeout=(REQUEST_TIMEOUT[0], 10), allow_redirects=True)
+
+def test_simple_api_connection(base_url, api_key, verbose=False):
     """Test basic API connectivity with a simple request."""
+    import requests
+
+    # urljoin reads a scheme-less base such as localhost:8000 as scheme:path
+    # and would drop the host
+    if not base_url.lower().startswith(('http://', 'https://')):
+        log_error("Base URL must start with http:// or https://, got: %s", base_url)
+        return False
+
+    session = get_session(api_key)
     try:
-        # Construct the models endpoint URL
-        if not base_url.endswith('/'):
-            base_url += '/'
-        if not base_url.endswith('v1/'):
-            base_url += 'v1/'
-
-        models_url = base_url.rstrip('/') + '/models'
-
-        headers = {
-            'Authorization': f'Bearer {api_key}',
-            'Content-Type': 'application/json'
-        }
-
-        log_info(f"Testing connection to: {models_url}")
-        log_info(f"Using API key (first 10 chars): {api_key[:10]}...")
-
-        response = requests.get(models_url, headers=headers, timeout=30)
-
-        if response.status_code == 200:
-            log_success("API connection successful")
-            try:
-                models_data = response.json()
-                if 'data' in models_data and isinstance(models_data['data'], list):
-                    model_count = len(models_data['data'])
-                    log_success(f"Found {model_count} available models")
-                    if model_count > 0:
-                        # Show first few model IDs
-                        model_ids = [model.get('id', 'unknown') for model in models_data['data'][:5]]
-                        log_info(f"Sample models: {', '.join(model_ids)}")
-                    return True
-                else:
-                    log_error("Unexpected response format from /models endpoint")
-                    return False
-            except json.JSONDecodeError:
-                log_error("Failed to parse JSON response from /models endpoint")
-                return False
+        models_url = get_models_url(base_url)
+
+        log_info("Testing connection to: %s", models_url)
+        log_info("Using API key (first 10 chars): %s...", api_key[:10])
+
+        if verbose:
+            response = session.get(models_url, timeout=REQUEST_TIMEOUT, stream=True)
         else:
-            log_error(f"API request failed with status {response.status_code}")
-            log_error(f"Response: {response.text[:200]}")
+            response = probe_reachable(session, models_url)
+            if response.status_code in (405, 501):
+                # Endpoint does not support HEAD, fall back to a full request
+                response = session.get(models_url, timeout=REQUEST_TIMEOUT)
+
+        if response.status_code != 200:
+            log_error("API request failed with status %s", response.status_code)
+            if response.content:
+                # Decode only the bytes shown; response.text would decode and
+                # charset-sniff the whole body first
+                log_error("Response: %s", response.content[:200].decode('utf-8', errors='replace'))
             return False
 
-    except requests.exceptions.Timeout:
-        log_error("Connection timeout (30s)")
-        return False
-    except requests.exceptions.ConnectionError:
-        log_error("Connection error - unable to reach API endpoint")
-        return False
-    except Exception as e:
-        log_error(f"Unexpected error during connection test: {str(e)}")
-        return False
+        log_success("API connection successful")
+        if not verbose:
+            return True
 
-def test_guidellm_import():
-    """Test if guidellm can be imported successfully."""
-    try:
-        import guidellm
-        log_success("guidellm imported successfully")
+        try:
+            with response:
+                sampled = sample_model_ids(response)
+        except ValueError:
+            log_error("Failed to parse JSON response from /models endpoint")
+            return False
+        except (TypeError, AttributeError):
+            # Valid JSON whose shape sample_model_ids does not expect
+            log_error("Unexpected response format from /models endpoint")
+            return False
+
+        if sampled is None:
+            log_error("Unexpected response format from /models endpoint")
+            return False
+
+        model_count, model_ids = sampled
+        more = '+' if model_count >= MAX_MODELS_COUNTED else ''
+        log_success("Found %d%s available models", model_count, more)
+        if model_ids:
+            log_info("Sample models: %s", ', '.join(model_ids))
         return True
-    except ImportError as e:
-        log_error(f"Failed to import guidellm: {e}")
+
+    except requests.RequestException as e:
+        # Timeouts and connection errors are RequestException subclasses; the
+        # class name says which one ended the final retry
+        log_error("%s: %s", type(e).__name__, e)
         return False
 
-def test_guidellm_configuration():
-    """Test guidellm environment configuration."""
+def test_guidellm(deep=False):
+    """Test guidellm installation and, with deep=True, its import and configuration.
+
+    Returns (imported_ok, config_ok); config_ok is None when the configuration
+    check is skipped.
+    """
+    import importlib.util
+
+    start = time.perf_counter()
     try:
-        # Check if guidellm can read the configuration
-        from guidellm.config import get_environment
-        env_config = get_environment()
+        if importlib.util.find_spec('guidellm') is None:
+            log_error("guidellm package not found")
+            return False, (False if deep else None)
+        if not deep:
+            log_success("guidellm package found")
+            return True, None
+
+        try:
+            import guidellm
+        except ImportError as e:
+            log_error("Failed to import guidellm: %s", e)
+            return False, False
+        log_success("guidellm imported successfully")
+
+        try:
+            # Check if guidellm can read the configuration
+            from guidellm.config import get_environment
+            env_config = get_environment()
+        except Exception as e:
+            log_error("guidellm configuration error: %s", e)
+            return True, False
         log_success("guidellm configuration loaded")
-        return True
-    except Exception as e:
-        log_error(f"guidellm configuration error: {e}")
-        return False
+        return True, True
+    finally:
+        log_info("guidellm checks took %.2fs", time.perf_counter() - start)
 
 def main():
     """Main verification function."""
+    import argparse
+    parser = argparse.ArgumentParser(description='Verify API connectivity before running benchmarks')
+    parser.add_argument('--verbose', action='store_true', help='List available models from the /models endpoint')
+    parser.add_argument('--deep', action='store_true', help='Import guidellm and load its configuration instead of only checking it is installed')
+
+    args = parser.parse_args()
+
     log_info("Starting connection verification for guidellm benchmark")
 
     # Get environment variables
-    base_url = get_env_var('GUIDELLM__OPENAI__BASE_URL') or get_env_var('OPENAI_API_BASE')
-    api_key = get_env_var('GUIDELLM__OPENAI__API_KEY') or get_env_var('OPENAI_API_KEY')
+    base_url, base_url_var = get_first_env(('GUIDELLM__OPENAI__BASE_URL', 'OPENAI_API_BASE'))
+    api_key, api_key_var = get_first_env(('GUIDELLM__OPENAI__API_KEY', 'OPENAI_API_KEY'))
 
     if not base_url or not api_key:
         log_error("Missing required environment variables")
         log_error("Required: GUIDELLM__OPENAI__BASE_URL and GUIDELLM__OPENAI__API_KEY")
         log_error("Or: OPENAI_API_BASE and OPENAI_API_KEY")
         return 1
+    log_info("Using base URL from %s and API key from %s", base_url_var, api_key_var)
 
-    # Run verification tests
-    success_count = 0
-    total_tests = 3
-
-    # Test 1: Basic API connectivity
-    log_info("\n=== Test 1: API Connectivity ===")
-    if test_simple_api_connection(base_url, api_key):
-        success_count += 1
+    # Run verification tests concurrently; the API probe spends most of its
+    # time waiting on the network while the guidellm checks are local
+    from concurrent.futures import ThreadPoolExecutor
 
-    # Test 2: guidellm import
-    log_info("\n=== Test 2: guidellm Import ===")
-    if test_guidellm_import():
-        success_count += 1
+    log_info("\n=== Running verification tests ===")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        api_future = executor.submit(test_simple_api_connection, base_url, api_key, args.verbose)
+        guidellm_future = executor.submit(test_guidellm, args.deep)
+        api_ok = api_future.result()
+        imported_ok, config_ok = guidellm_future.result()
 
-    # Test 3: guidellm configuration
-    log_info("\n=== Test 3: guidellm Configuration ===")
-    if test_guidellm_configuration():
-        success_count += 1
+    # Without --deep only the installation is checked, not the import
+    guidellm_test = "guidellm Import" if args.deep else "guidellm Installed"
+    results = [("API Connectivity", api_ok), (guidellm_test, imported_ok)]
+    if config_ok is not None:
+        results.append(("guidellm Configuration", config_ok))
+    total_tests = len(results)
 
     # Final result
-    log_info(f"\n=== Verification Summary ===")
-    log_info(f"Passed: {success_count}/{total_tests} tests")
+    log_info("\n=== Verification Summary ===")
+    for i, (name, passed) in enumerate(results, 1):
+        log_info("Test %d: %s - %s", i, name, 'passed' if passed else 'failed')
+    success_count = sum(1 for _, passed in results if passed)
+    log_info("Passed: %d/%d tests", success_count, total_tests)
 
     if success_count == total_tests:
         log_success("All verification tests passed ✓")
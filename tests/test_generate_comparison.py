@@ -0,0 +1,92 @@
+"""Tests for CSV metric extraction in generate_comparison.py."""
+import csv
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import generate_comparison
+
+
+def dictreader_metrics(path):
+    """Metrics as computed before the single-pass reducer, via csv.DictReader."""
+    with open(path, 'r') as f:
+        data = list(csv.DictReader(f))
+
+    metrics = {}
+    if not data:
+        return metrics
+    for field in generate_comparison.NUMERIC_FIELDS:
+        if field in data[0]:
+            try:
+                values = [float(row.get(field, 0)) for row in data if row.get(field)]
+                if values:
+                    metrics[field] = {
+                        'avg': sum(values) / len(values),
+                        'min': min(values),
+                        'max': max(values),
+                        'count': len(values)
+                    }
+            except (ValueError, TypeError):
+                continue
+    metrics['total_requests'] = len(data)
+    successful = sum(1 for row in data if not row.get('error'))
+    metrics['success_rate'] = (successful / len(data)) * 100
+    return metrics
+
+
+class ExtractMetricsFromCsvTest(unittest.TestCase):
+
+    def extract(self, text):
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'w', newline='') as f:
+            f.write(text)
+        metrics = generate_comparison.extract_metrics_from_csv(path)
+        self.assertEqual(metrics, dictreader_metrics(path))
+        return metrics
+
+    def test_blank_lines(self):
+        metrics = self.extract('request_latency,tokens_per_second,error\n1.0,10,\n2.0,20,boom\n\n\n')
+        self.assertEqual(metrics['total_requests'], 2)
+        self.assertEqual(metrics['success_rate'], 50.0)
+        self.assertEqual(metrics['request_latency'], {'avg': 1.5, 'min': 1.0, 'max': 2.0, 'count': 2})
+
+    def test_short_rows(self):
+        metrics = self.extract('request_latency,tokens_per_second,error\n1.0,10,\n3.0\n2.0,,timeout\n')
+        self.assertEqual(metrics['total_requests'], 3)
+        self.assertEqual(metrics['tokens_per_second'], {'avg': 10.0, 'min': 10.0, 'max': 10.0, 'count': 1})
+
+    def test_missing_error_column(self):
+        metrics = self.extract('request_latency,prompt_tokens\n1.0,100\n2.0,200\n')
+        self.assertEqual(metrics['success_rate'], 100.0)
+        self.assertEqual(metrics['prompt_tokens']['avg'], 150.0)
+
+    def test_non_numeric_cell(self):
+        metrics = self.extract('request_latency,tokens_per_second,error\n1.0,10,\n2.0,n/a,\n3.0,30,\n')
+        self.assertNotIn('tokens_per_second', metrics)
+        self.assertEqual(metrics['request_latency']['count'], 3)
+
+    def test_header_only(self):
+        self.assertEqual(self.extract('request_latency,tokens_per_second,error\n'), {})
+
+    def test_empty_file(self):
+        self.assertEqual(self.extract(''), {})
+
+
+class LoadResultDataTest(unittest.TestCase):
+
+    def test_non_finite_numbers(self):
+        fd, path = tempfile.mkstemp(suffix='.json')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'w') as f:
+            f.write('[{"request_latency": NaN}, {"request_latency": 1.5}]')
+        data = generate_comparison.load_result_data(path)
+        self.assertEqual(len(data), 2)
+        self.assertEqual(data[1]['request_latency'], 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
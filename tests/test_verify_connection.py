@@ -0,0 +1,72 @@
+"""Tests for parsing the /models response in verify_connection.py."""
+import importlib.util
+import io
+import os
+import sys
+import unittest
+from unittest import mock
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import verify_connection
+
+HAS_IJSON = importlib.util.find_spec('ijson') is not None
+
+
+def make_response(body):
+    """Build a streamed requests.Response whose body is body."""
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(body)
+    return response
+
+
+class SampleModelIdsTest(unittest.TestCase):
+
+    def check_malformed(self):
+        for body in (b'{"data":[{"id":"a"},', b'<html>error page</html>'):
+            with self.subTest(body=body):
+                with self.assertRaises(ValueError):
+                    verify_connection.sample_model_ids(make_response(body))
+
+    def check_valid(self):
+        body = b'{"object":"list","data":[{"id":"a"},{"id":"b"},{"name":"c"}]}'
+        self.assertEqual(verify_connection.sample_model_ids(make_response(body), limit=2), (3, ['a', 'b']))
+        self.assertIsNone(verify_connection.sample_model_ids(make_response(b'{"object":"list"}')))
+
+    def check_odd_entries(self):
+        body = b'{"data":[{"id":5},{"id":{"x":1}},"stray",{"id":"z"},[{"id":"nested"}],{"id":null},{"id":true}]}'
+        self.assertEqual(
+            verify_connection.sample_model_ids(make_response(body), limit=10),
+            (5, ['5', 'unknown', 'z', 'unknown', 'unknown'])
+        )
+
+    @unittest.skipUnless(HAS_IJSON, 'ijson not installed')
+    def test_odd_entries_streaming(self):
+        self.check_odd_entries()
+
+    def test_odd_entries_without_ijson(self):
+        with mock.patch.dict(sys.modules, {'ijson': None}):
+            self.check_odd_entries()
+
+    @unittest.skipUnless(HAS_IJSON, 'ijson not installed')
+    def test_malformed_body_streaming(self):
+        self.check_malformed()
+
+    @unittest.skipUnless(HAS_IJSON, 'ijson not installed')
+    def test_valid_body_streaming(self):
+        self.check_valid()
+
+    def test_malformed_body_without_ijson(self):
+        with mock.patch.dict(sys.modules, {'ijson': None}):
+            self.check_malformed()
+
+    def test_valid_body_without_ijson(self):
+        with mock.patch.dict(sys.modules, {'ijson': None}):
+            self.check_valid()
+
+
+if __name__ == '__main__':
+    unittest.main()